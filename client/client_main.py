@@ -1,3 +1,5 @@
+import logging
+import os
 import socket
 import sys
 
@@ -11,21 +13,70 @@ from common.protocol import (
     unpack_server_payload,
     pack_client_payload_decision,
 )
-from common.net_utils import recv_exact
+from common.net_utils import FramedReader
 
 from client.strategy import DeckCounter, choose_decision, hand_value
 
-from colorama import init, Fore, Style
-init(autoreset=True)  # Auto-reset colors after each print
+if sys.stdout.isatty():
+    from colorama import init, Fore, Style
+    init(autoreset=True)  # Auto-reset colors after each print
+else:
+    # Output is piped/redirected: skip colorama's stream wrapper and emit no color codes
+    class _NoColor:
+        def __getattr__(self, _name):
+            return ""
 
+    Fore = Style = _NoColor()
 
-def format_card(rank, suit):
-    """Format card with colors: Red for ♥♦, Black for ♣♠"""
-    suits = {0: "♥", 1: "♦", 2: "♣", 3: "♠"}
-    ranks = {1: "A", 11: "J", 12: "Q", 13: "K"}
+TEAM_NAME = "RanTeam"
+TCP_SOCKET_BUFFER_BYTES = 64 * 1024
+
+# Per-card / per-decision game events go through this logger (not print), so AUTO mode
+# can silence them with a level check instead of formatting and writing every line.
+# The round's lines are collected in memory and written with a single stdout write (flush_log);
+# the buffer is also flushed before anything printed directly (prompts, outcome, errors).
+log = logging.getLogger(__name__)
+
+
+class _RoundBuffer(logging.Handler):
+    """Collect formatted records; flush() writes them all in one write (no per-line stdout flush)."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+_log_buffer = _RoundBuffer()
+
+
+def flush_log():
+    _log_buffer.flush()
+
+# AUTO mode skips the per-card output (nobody reads it); BJ_VERBOSE=1 turns it back on
+VERBOSE = os.environ.get("BJ_VERBOSE", "") not in ("", "0")
+
+# Only two decision messages exist - pack them once
+_DECISION_BYTES = {
+    "Hittt": pack_client_payload_decision("Hittt"),
+    "Stand": pack_client_payload_decision("Stand"),
+}
 
-    r_str = ranks.get(rank, str(rank))
-    s_str = suits.get(suit, "?")
+_SUIT_STR = ("♥", "♦", "♣", "♠")  # 0=Hearts, 1=Diamonds, 2=Clubs, 3=Spades
+_RANK_STR = ("", "A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+
+
+def _render_card(rank, suit):
+    """Format card with colors: Red for ♥♦, Black for ♣♠"""
+    r_str = _RANK_STR[rank] if 1 <= rank <= 13 else str(rank)
+    s_str = _SUIT_STR[suit] if 0 <= suit <= 3 else "?"
 
     # Red suits (Hearts, Diamonds), Black suits (Clubs, Spades)
     if suit in (0, 1):  # Hearts, Diamonds
@@ -36,8 +87,32 @@ def format_card(rank, suit):
     return f"{color}[{r_str}{s_str}]{Style.RESET_ALL}"
 
 
+# All 52 card strings are rendered once at import
+_CARD_STR = {(rank, suit): _render_card(rank, suit) for rank in range(1, 14) for suit in range(4)}
+
+_DECISION_PROMPT = f"{Fore.CYAN}[CLIENT] Your decision (h=Hit / s=Stand): {Style.RESET_ALL}"
+
+
+def format_card(rank, suit):
+    """Format card with colors (table lookup; out-of-range values are rendered on the fly)."""
+    card_str = _CARD_STR.get((rank, suit))
+    return card_str if card_str is not None else _render_card(rank, suit)
+
+
+def log_card_event(who, res, rank, suit):
+    """Log a card received during the round (marked as Final when it ends the round)."""
+    card_str = format_card(rank, suit)
+    if res != 0:
+        # final card event
+        log.info("[CLIENT] %s (Final): %s", who, card_str)
+    else:
+        # regular card event
+        log.info("[CLIENT] %s: %s", who, card_str)
+
+
 def main():
-    team_name = "RanTeam"
+    log.addHandler(_log_buffer)
+    log.propagate = False
 
     # 1. Ask user for input (Instruction Requirement)
     # while True:
@@ -55,6 +130,26 @@ def main():
     #
     #     break
 
+    # --- UDP listen for offers (kept open across sessions) ---
+    udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    # --- Cross-platform Reuse Port Fix ---
+    # Windows uses SO_REUSEADDR. Linux needs SO_REUSEPORT.
+    try:
+        udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    except AttributeError:
+        pass
+
+    try:
+        # SO_REUSEPORT is not defined in Windows python, so we wrap in try/except
+        udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    except AttributeError:
+        # This happens on Windows, which is fine because REUSEADDR handles it there
+        pass
+    # -------------------------------------
+
+    udp_sock.bind(("", OFFER_BROADCAST_UDP_PORT))
+
     # 2. Run forever (Instruction Requirement)
     while True:
         # 🆕 NEW: Ask for rounds at the start of each session
@@ -68,6 +163,7 @@ def main():
             # Allow quitting
             if user_input.lower() == 'q':
                 print("[CLIENT] Exiting...")
+                udp_sock.close()
                 return
 
             try:
@@ -108,59 +204,51 @@ def main():
 
         print(f"[CLIENT] Listening for offers on UDP {OFFER_BROADCAST_UDP_PORT}...")
 
-        # --- UDP listen for offers ---
-        udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-
-        # --- Cross-platform Reuse Port Fix ---
-        # Windows uses SO_REUSEADDR. Linux needs SO_REUSEPORT.
-        try:
-            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        except AttributeError:
-            pass
 
+        # drop offers that queued up while we were playing / waiting for input
+        udp_sock.setblocking(False)
         try:
-            # SO_REUSEPORT is not defined in Windows python, so we wrap in try/except
-            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-        except AttributeError:
-            # This happens on Windows, which is fine because REUSEADDR handles it there
+            while True:
+                udp_sock.recvfrom(1024)
+        except BlockingIOError:
             pass
-        # -------------------------------------
-
-        udp_sock.bind(("", OFFER_BROADCAST_UDP_PORT))
+        udp_sock.setblocking(True)
 
         server_ip = None
         server_port = None
         server_name = None
 
-        try:
-            # 1) wait for a valid offer
-            while True:
-                data, addr = udp_sock.recvfrom(1024)
-                offer = unpack_offer(data)
-                if offer is None:
-                    continue
-
-                server_ip = addr[0]
-                server_port = offer["server_tcp_port"]
-                server_name = offer["server_name"]
-                print(f"[CLIENT] Received offer from {server_ip} | server_name='{server_name}'")
-                break
-        finally:
-            udp_sock.close()
+        # 1) wait for a valid offer
+        while True:
+            data, addr = udp_sock.recvfrom(1024)
+            offer = unpack_offer(data)
+            if offer is None:
+                continue
+
+            server_ip = addr[0]
+            server_port = offer.server_tcp_port
+            server_name = offer.server_name
+            print(f"[CLIENT] Received offer from {server_ip} | server_name='{server_name}'")
+            break
 
         # 2) Connect and Play Session
         print(f"[CLIENT] Connecting to {server_ip}:{server_port}...")
         try:
             tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)  # TCP socket
             tcp_sock.settimeout(15.0)  # 15 seconds timeout for connect
+            # larger socket buffers; set before connect so the window is negotiated with them
+            tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, TCP_SOCKET_BUFFER_BYTES)
+            tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, TCP_SOCKET_BUFFER_BYTES)
             tcp_sock.connect((server_ip, server_port))  # connect to server
+            # decisions are tiny request/response messages: don't let Nagle hold them back
+            tcp_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
             client_port = tcp_sock.getsockname()[1]
             print(f"[CLIENT] Connected from local port {client_port}")
 
             # Send request
-            tcp_sock.sendall(pack_request(rounds, team_name))
-            print(f"[CLIENT] Sent request: rounds={rounds} team='{team_name}'")
+            tcp_sock.sendall(pack_request(rounds, TEAM_NAME))
+            print(f"[CLIENT] Sent request: rounds={rounds} team='{TEAM_NAME}'")
 
             # Play session statistics
             stats = {
@@ -171,6 +259,11 @@ def main():
 
             # 3) Play rounds logic
             deck_counter = DeckCounter()
+            log.setLevel(logging.INFO if (not auto_mode or VERBOSE) else logging.WARNING)
+            show_cards = log.isEnabledFor(logging.INFO)  # also skips building the card strings
+
+            # buffered reader: one recv can deliver several card payloads
+            reader = FramedReader(tcp_sock)
 
             for round_i in range(rounds):
                 print(f"\n[CLIENT] === Round {round_i + 1} ===")
@@ -180,14 +273,13 @@ def main():
 
                 # initial 3 payloads: player, player, dealer upcard
                 for j in range(3):
-                    raw = recv_exact(tcp_sock, SERVER_PAYLOAD_MESSAGE_BYTES)
-                    srv = unpack_server_payload(raw)
+                    srv = unpack_server_payload(reader.read(SERVER_PAYLOAD_MESSAGE_BYTES))
                     if srv is None:
                         raise ValueError("Invalid server payload (initial deal)")
 
-                    r = srv["rank"]
-                    s = srv["suit"]
-                    res = srv["result"]
+                    r = srv.rank
+                    s = srv.suit
+                    res = srv.result
 
                     deck_counter.remove_seen(r)
 
@@ -198,100 +290,96 @@ def main():
                         dealer_up_rank = r
                         who = "DEALER_UP"
 
-                    print(f"[CLIENT] {who}: {format_card(r, s)}") # format card
-
-                player_turn = True
-                last_decision = None
+                    if show_cards:
+                        log.info("[CLIENT] %s: %s", who, format_card(r, s)) # format card
 
+                # --- Player phase: decide, send, read the drawn card ---
+                res = 0
                 while True:
-                    # If it's still player turn, decide and send decision
-                    if player_turn:
-                        # 🆕 Mode-based decision
-                        if auto_mode:
-                            # Automatic strategy
-                            decision = choose_decision(player_ranks, dealer_up_rank, deck_counter)
+                    # 🆕 Mode-based decision
+                    if auto_mode:
+                        # Automatic strategy
+                        decision = choose_decision(player_ranks, dealer_up_rank, deck_counter)
+                        if show_cards:
                             dec_color = Fore.GREEN if decision == "Stand" else Fore.YELLOW
-                            print(f"[CLIENT] {dec_color}AUTO decision -> {decision}{Style.RESET_ALL}")
-                        else:
-                            # Manual mode
-                            total, soft = hand_value(player_ranks)
-                            soft_str = f"{Fore.CYAN} (soft){Style.RESET_ALL}" if soft else ""
-
-                            print(f"\n{Fore.YELLOW}[CLIENT] 🎯 YOUR TURN{Style.RESET_ALL}")
-                            print(f"[CLIENT] Your total: {Fore.CYAN}{total}{Style.RESET_ALL}{soft_str}")
-                            # Display all player cards with varied suits for visual variety
-                            player_cards_display = ' '.join([format_card(r, i % 4) for i, r in enumerate(player_ranks)])
-                            print(f"[CLIENT] Your cards: {player_cards_display}")
-
-                            bust_prob = deck_counter.bust_probability_if_hit(player_ranks)
-                            prob_color = Fore.RED if bust_prob > 0.6 else Fore.YELLOW if bust_prob > 0.4 else Fore.GREEN
-                            print(f"[CLIENT] {prob_color}📊 Bust chance if Hit: {bust_prob * 100:.1f}%{Style.RESET_ALL}")
-
-                            while True:
-                                choice = input(
-                                    f"{Fore.CYAN}[CLIENT] Your decision (h=Hit / s=Stand): {Style.RESET_ALL}").strip().lower()
-                                if choice == 'h':
-                                    decision = "Hittt"
-                                    break
-                                elif choice == 's':
-                                    decision = "Stand"
-                                    break
-                                else:
-                                    print(f"{Fore.RED}❌ Invalid input. Enter 'h' or 's'.{Style.RESET_ALL}")
+                            log.info("[CLIENT] %sAUTO decision -> %s%s", dec_color, decision, Style.RESET_ALL)
+                    else:
+                        # Manual mode
+                        flush_log()  # show the cards so far before the prompt
+                        total, soft = hand_value(player_ranks)
+                        soft_str = f"{Fore.CYAN} (soft){Style.RESET_ALL}" if soft else ""
+
+                        print(f"\n{Fore.YELLOW}[CLIENT] 🎯 YOUR TURN{Style.RESET_ALL}")
+                        print(f"[CLIENT] Your total: {Fore.CYAN}{total}{Style.RESET_ALL}{soft_str}")
+                        # Display all player cards with varied suits for visual variety
+                        player_cards_display = ' '.join([format_card(r, i % 4) for i, r in enumerate(player_ranks)])
+                        print(f"[CLIENT] Your cards: {player_cards_display}")
+
+                        bust_prob = deck_counter.bust_probability_if_hit(player_ranks)
+                        prob_color = Fore.RED if bust_prob > 0.6 else Fore.YELLOW if bust_prob > 0.4 else Fore.GREEN
+                        print(f"[CLIENT] {prob_color}📊 Bust chance if Hit: {bust_prob * 100:.1f}%{Style.RESET_ALL}")
+
+                        while True:
+                            choice = input(_DECISION_PROMPT).strip().lower()
+                            if choice == 'h':
+                                decision = "Hittt"
+                                break
+                            elif choice == 's':
+                                decision = "Stand"
+                                break
+                            else:
+                                print(f"{Fore.RED}❌ Invalid input. Enter 'h' or 's'.{Style.RESET_ALL}")
+
+                        dec_color = Fore.GREEN if decision == "Stand" else Fore.YELLOW
+                        print(f"[CLIENT] {dec_color}MANUAL decision -> {decision}{Style.RESET_ALL}\n")
+
+                    tcp_sock.sendall(_DECISION_BYTES[decision])
+                    if decision == "Stand":
+                        break
 
-                            dec_color = Fore.GREEN if decision == "Stand" else Fore.YELLOW
-                            print(f"[CLIENT] {dec_color}MANUAL decision -> {decision}{Style.RESET_ALL}\n")
+                    srv = unpack_server_payload(reader.read(SERVER_PAYLOAD_MESSAGE_BYTES))
+                    if srv is None:
+                        raise ValueError("Invalid server payload")
+
+                    res = srv.result
+                    rank = srv.rank
+                    deck_counter.remove_seen(rank)
+                    player_ranks.append(rank)
 
-                        last_decision = decision
-                        tcp_sock.sendall(pack_client_payload_decision(decision))
+                    if show_cards:
+                        log_card_event("PLAYER_DRAW", res, rank, srv.suit)
 
-                        if decision == "Stand":
-                            player_turn = False
+                    if res != 0:
+                        break  # player busted
 
-                    # Always receive next server payload
-                    raw = recv_exact(tcp_sock, SERVER_PAYLOAD_MESSAGE_BYTES)
-                    srv = unpack_server_payload(raw)
+                # --- Dealer phase: no more decisions, read cards until the final payload ---
+                while res == 0:
+                    srv = unpack_server_payload(reader.read(SERVER_PAYLOAD_MESSAGE_BYTES))
                     if srv is None:
                         raise ValueError("Invalid server payload")
 
-                    res = srv["result"]
-                    rank = srv["rank"]
-                    suit = srv["suit"]
-
+                    res = srv.result
+                    rank = srv.rank
                     deck_counter.remove_seen(rank)
 
-                    # If we hit and it's still player turn context, this card is usually for the player
-                    if player_turn and last_decision == "Hittt":
-                        player_ranks.append(rank)
-                        who = "PLAYER_DRAW"
-                    else:
-                        who = "DEALER_EVENT"
+                    if show_cards:
+                        log_card_event("DEALER_EVENT", res, rank, srv.suit)
 
-                    # Print card event
-                    card_str = format_card(rank, suit)
-                    if res != 0:
-                        # final card event
-                        print(f"[CLIENT] {who} (Final): {card_str}")
-                    else:
-                        # regular card event
-                        print(f"[CLIENT] {who}: {card_str}")
+                flush_log()
 
+                # Round ended (1=tie,2=loss,3=win)
+                outcome = "UNKNOWN"
+                if res == 1:
+                    outcome = "TIE"
+                    stats["ties"] += 1
+                elif res == 2:
+                    outcome = "LOSS"
+                    stats["losses"] += 1
+                elif res == 3:
+                    outcome = "WIN"
+                    stats["wins"] += 1
 
-                    if res != 0:
-                        # Round ended (1=tie,2=loss,3=win)
-                        outcome = "UNKNOWN"
-                        if res == 1:
-                            outcome = "TIE"
-                            stats["ties"] += 1
-                        elif res == 2:
-                            outcome = "LOSS"
-                            stats["losses"] += 1
-                        elif res == 3:
-                            outcome = "WIN"
-                            stats["wins"] += 1
-
-                        print(f"[CLIENT] Round ended -> {outcome}")
-                        break
+                print(f"[CLIENT] Round ended -> {outcome}")
 
             tcp_sock.close()
 
@@ -309,10 +397,12 @@ def main():
             print("[CLIENT] Session finished. Returning to listen state...\n")
 
         except socket.timeout:
+            flush_log()
             print("\n[CLIENT] Error: Server stopped responding (Timeout).")
             print("[CLIENT] Returning to listen state...\n")
 
         except Exception as e:
+            flush_log()
             print(f"[CLIENT] Error during session: {e}")
             # We don't exit, we just loop back to listen for offers
 
@@ -1,24 +1,30 @@
 from __future__ import annotations
-from collections import Counter
-from typing import List, Tuple
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+# Blackjack value by rank (index 0 unused): A=1, 2..10 face value, J/Q/K=10
+_VAL = bytes([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10])
+
+# Max bust probability we accept for a hit, by dealer upcard (index 0 = unknown upcard).
+# 7-A is a "strong" dealer card -> be more aggressive; 2-6 is "weak" -> be more conservative.
+_DEALER_THRESH = (0.45, 0.55, 0.40, 0.40, 0.40, 0.40, 0.40, 0.55, 0.55, 0.55, 0.55, 0.55, 0.55, 0.55)
 
 
 def bj_value(rank: int) -> int:
-    if rank == 1:
-        return 1
-    if 2 <= rank <= 10:
-        return rank
-    return 10
+    return _VAL[rank]  # rank 1..13
 
 
 def hand_value(ranks: List[int]) -> Tuple[int, bool]:
-    total = sum(bj_value(r) for r in ranks)
-    aces = sum(1 for r in ranks if r == 1)
-    soft = False
-    if aces > 0 and total + 10 <= 21:
-        total += 10
-        soft = True
-    return total, soft
+    # single pass: table lookup for the value + running ace count
+    total = 0
+    aces = 0
+    for r in ranks:
+        total += _VAL[r]
+        aces += (r == 1)
+    if aces and total + 10 <= 21:
+        return total + 10, True
+    return total, False
 
 
 class DeckCounter:
@@ -26,45 +32,58 @@ class DeckCounter:
     Track remaining deck composition (52 cards).
     We only update based on seen cards (player cards + dealer upcard + dealer revealed cards).
     """
+    __slots__ = ("counts", "_total")
+
     def __init__(self):
-        self.counts = Counter()
-        for rank in range(1, 14):
-            self.counts[rank] = 4  # 4 suits
+        # dense count per rank, indexed directly by rank 1..13 (index 0 unused)
+        self.counts = array("b", [0] + [4] * 13)  # 4 suits
+        self._total = 52  # kept in sync with counts by remove_seen
 
     def remove_seen(self, rank: int) -> None:
-        if self.counts[rank] > 0:
+        if self.counts[rank]:
             self.counts[rank] -= 1
+            self._total -= 1
+
+    def deck_sig(self) -> Tuple[int, ...]:
+        """Hashable snapshot of the remaining counts (indexed by rank, slot 0 unused), used as a cache key."""
+        return tuple(self.counts)
 
     def total_remaining(self) -> int:
-        return sum(self.counts.values())
+        return self._total
 
     def bust_probability_if_hit(self, player_ranks: List[int]) -> float:
-        total_cards = self.total_remaining()
-        if total_cards == 0:
-            return 0.0
+        # value the current hand once; the post-hit totals are derived from it
+        total, soft = hand_value(player_ranks)
+        return _bust_prob(self.deck_sig(), total, soft, self._total)
 
-        bust = 0
-        for rank, cnt in self.counts.items():
-            if cnt <= 0:
-                continue
-            new_ranks = player_ranks + [rank]
-            new_total, _ = hand_value(new_ranks)
-            if new_total > 21:
-                bust += cnt
 
-        return bust / total_cards
-
-
-def choose_decision(player_ranks: List[int], dealer_up_rank: int | None, deck: DeckCounter) -> str:
+def bust_probability(counts: Sequence[int], total: int, soft: bool, remaining: int | None = None) -> float:
     """
-    Heuristic-statistical strategy:
-    - Always hit <= 11
-    - Always stand >= 17
-    - Otherwise: compute bust probability from remaining deck
-      and adjust threshold using dealer upcard (aggressive vs strong dealer card).
+    Bust probability for one more card, given remaining counts indexed by rank
+    (slot 0 unused, same layout as DeckCounter.counts) and the current (total, soft).
+    `remaining` is the number of cards left (sum of counts); pass it when already known
+    (DeckCounter tracks it) to skip the sum.
+    Card values are non-decreasing with rank (A..10, then J/Q/K=10), so the busting ranks
+    are always a suffix of counts and the whole computation is one slice sum.
+    Not cached - meant for batch callers (e.g. offline strategy sweeps) that pass raw count vectors.
     """
-    total, soft = hand_value(player_ranks)
+    margin = 21 - total  # highest card value that still does not bust
+    if soft or margin >= 10:
+        return 0.0  # a soft hand falls back to its hard total, so one card never busts it
+    if remaining is None:
+        remaining = sum(counts[1:])
+    if remaining == 0:
+        return 0.0
+    return sum(counts[max(margin, 0) + 1:]) / remaining
+
 
+# live play revisits the same (deck, total, soft) states, so the in-game path is memoized
+# (`remaining` is derived from the deck, so it doesn't split the cache)
+_bust_prob = lru_cache(maxsize=4096)(bust_probability)
+
+
+@lru_cache(maxsize=4096)
+def _decide(deck_sig: Tuple[int, ...], remaining: int, total: int, soft: bool, dealer_up_rank: int | None) -> str:
     if total <= 11:
         return "Hittt"
     if total >= 17 and not soft:
@@ -72,15 +91,21 @@ def choose_decision(player_ranks: List[int], dealer_up_rank: int | None, deck: D
     if total >= 18 and soft:
         return "Stand"
 
-    p_bust = deck.bust_probability_if_hit(player_ranks)
+    p_bust = _bust_prob(deck_sig, total, soft, remaining)
 
-    # Dealer upcard strength: 7-A is "strong", 2-6 is "weak"
-    if dealer_up_rank is None:
-        threshold = 0.45
-    else:
-        if dealer_up_rank in (1, 10, 11, 12, 13, 9, 8, 7):
-            threshold = 0.55  # be more aggressive
-        else:
-            threshold = 0.40  # be more conservative
+    threshold = _DEALER_THRESH[dealer_up_rank or 0]
 
     return "Hittt" if p_bust <= threshold else "Stand"
+
+
+def choose_decision(player_ranks: List[int], dealer_up_rank: int | None, deck: DeckCounter) -> str:
+    """
+    Heuristic-statistical strategy:
+    - Always hit <= 11
+    - Always stand >= 17
+    - Otherwise: compute bust probability from remaining deck
+      and adjust threshold using dealer upcard (aggressive vs strong dealer card).
+    The decision only depends on (deck, total, soft, dealer upcard), so it is memoized on that key.
+    """
+    total, soft = hand_value(player_ranks)
+    return _decide(deck.deck_sig(), deck.total_remaining(), total, soft, dealer_up_rank)
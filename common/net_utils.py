@@ -1,13 +1,41 @@
-def recv_exact(sock, n: int) -> bytes:
+class FramedReader:
     """
-    TCP is a byte-stream, so a single recv(n) may return fewer than n bytes.
-    Our protocol messages have fixed sizes (e.g., 38/10/9 bytes),
-    so we loop until exactly n bytes are received.
+    Read-ahead wrapper for our fixed-size TCP messages.
+    One recv_into() pulls whatever is already pending (e.g., a burst of 9-byte payloads),
+    and the following read() calls are served from memory.
     """
-    data = bytearray() # accumulate partial TCP reads efficiently
-    while len(data) < n:
-        chunk = sock.recv(n - len(data))
-        if not chunk:
-            raise ConnectionError("Socket closed while reading")
-        data.extend(chunk)
-    return bytes(data)
+
+    def __init__(self, sock, capacity: int = 4096):
+        self.sock = sock
+        self.buf = bytearray(capacity)
+        self.view = memoryview(self.buf)
+        self.pos = 0  # start of unread data
+        self.end = 0  # end of buffered data
+
+    def read(self, n: int) -> memoryview:
+        """
+        Return exactly n bytes as a view into the internal buffer.
+        The view is only valid until the next read().
+        """
+        if self.end - self.pos < n:
+            self._fill(n)
+        start = self.pos
+        self.pos += n
+        return self.view[start:self.pos]
+
+    def _fill(self, n: int) -> None:
+        if n > len(self.buf):
+            raise ValueError("message larger than the read buffer")
+
+        # move the unread tail to the front so the refill has room
+        pending = self.end - self.pos
+        if self.pos:
+            self.buf[:pending] = self.buf[self.pos:self.end]
+            self.pos = 0
+            self.end = pending
+
+        while self.end < n:
+            got = self.sock.recv_into(self.view[self.end:])
+            if not got:
+                raise ConnectionError("Socket closed while reading")
+            self.end += got
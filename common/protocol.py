@@ -12,7 +12,7 @@ No sockets, no game logic.
 from __future__ import annotations
 
 import struct
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple
 
 from common.constants import (
     PROTOCOL_MAGIC_COOKIE,
@@ -20,33 +20,88 @@ from common.constants import (
     MSG_TYPE_REQUEST,
     MSG_TYPE_PAYLOAD,
     TEAM_NAME_FIELD_BYTES,
-    CLIENT_DECISION_FIELD_BYTES,
-    OFFER_MESSAGE_BYTES,
-    REQUEST_MESSAGE_BYTES,
-    CLIENT_PAYLOAD_MESSAGE_BYTES,
-    SERVER_PAYLOAD_MESSAGE_BYTES,
 )
 
+# Parsed messages: lightweight tuples with named fields (no per-message dict)
+class Offer(NamedTuple):
+    server_tcp_port: int
+    server_name: str
 
 
-def encode_fixed_name_32(name: str) -> bytes:
+class Request(NamedTuple):
+    rounds: int
+    client_team_name: str
+
+
+class ClientDecision(NamedTuple):
+    decision: str
+
+
+class ServerPayload(NamedTuple):
+    result: int
+    rank: int
+    suit: int
+
+
+# Precompiled formats: the format string is parsed once, not on every message.
+# Length checks use .size, so a message size can never disagree with its format.
+_OFFER_S = struct.Struct("!IBH32s")  # offer:          cookie | type | tcp_port | server_name
+_REQ_S = struct.Struct("!IBB32s")    # request:        cookie | type | rounds | team_name
+_CPAY_S = struct.Struct("!IB5s")     # client payload: cookie | type | decision
+_SPAY_S = struct.Struct("!IBBHB")    # server payload: cookie | type | result | rank | suit
+
+# Every message starts with cookie(4) | type(1): validate both with one bytes compare,
+# then unpack only the variable tail that follows the header.
+_HDR_BYTES = 5
+_OFFER_HDR = struct.pack("!IB", PROTOCOL_MAGIC_COOKIE, MSG_TYPE_OFFER)
+_REQ_HDR = struct.pack("!IB", PROTOCOL_MAGIC_COOKIE, MSG_TYPE_REQUEST)
+_PAYLOAD_HDR = struct.pack("!IB", PROTOCOL_MAGIC_COOKIE, MSG_TYPE_PAYLOAD)  # client + server payloads
+
+_OFFER_TAIL_S = struct.Struct("!H32s")  # tcp_port | server_name
+_REQ_TAIL_S = struct.Struct("!B32s")    # rounds | team_name
+_SPAY_TAIL_S = struct.Struct("!BHB")    # result | rank | suit
+
+# Bound methods for the per-card / per-decision paths (skip the attribute lookup per call)
+_spay_tail_unpack_from = _SPAY_TAIL_S.unpack_from
+
+# Every valid server payload (4 results x 13 ranks x 4 suits = 208 messages) packed once,
+# so packing a payload is a table lookup instead of a struct call.
+# Index: result(2 bits) | rank(4 bits) | suit(2 bits); slots for rank 0/14/15 stay None.
+_SPAY_SIZE = _SPAY_S.size
+_SPAY_TABLE = [None] * 256
+for _result in range(4):
+    for _rank in range(1, 14):
+        for _suit in range(4):
+            _SPAY_TABLE[(_result << 6) | (_rank << 2) | _suit] = _SPAY_S.pack(
+                PROTOCOL_MAGIC_COOKIE, MSG_TYPE_PAYLOAD, _result, _rank, _suit
+            )
+del _result, _rank, _suit
+
+# The only two valid decisions, as they appear on the wire (exactly 5 ASCII bytes each)
+_DECISION_ENCODED = {"Hittt": b"Hittt", "Stand": b"Stand"}
+_DECISION_DECODED = {b: d for d, b in _DECISION_ENCODED.items()}
+
+
+def encode_name_field(name: str) -> bytes:
     """
-    Encode a name into exactly 32 bytes : TEAM_NAME_FIELD_BYTES
-    - If shorter: pad with 0x00
+    Encode a name for the TEAM_NAME_FIELD_BYTES field, without padding.
+    Only pack the result into a "32s" struct field - that is what pads it with 0x00.
     - If longer: truncate
+    - If shorter: returned as-is (up to 32 bytes, unpadded)
     """
-    b = name.encode("utf-8", errors="replace")
-    b = b[:TEAM_NAME_FIELD_BYTES]
-    return b.ljust(TEAM_NAME_FIELD_BYTES, b"\x00")
+    try:
+        b = name.encode("ascii")  # common case, cheaper than the utf-8 codec
+    except UnicodeEncodeError:
+        b = name.encode("utf-8", errors="replace")
+    return b[:TEAM_NAME_FIELD_BYTES]
 
 
 def decode_fixed_name_32(raw: bytes) -> str:
     """
     Decode a 32-byte name field back into a Python string.
-    Stop at the first 0x00 byte.
+    Strip the trailing 0x00 padding (the "32s" field only ever pads at the end).
     """
-    name_bytes = raw.split(b"\x00", 1)[0]  # take bytes before the first 0x00
-    return name_bytes.decode("utf-8", errors="replace")
+    return raw.rstrip(b"\x00").decode("utf-8", errors="replace")
 
 
 # -------------------------
@@ -60,38 +115,33 @@ def pack_offer(server_tcp_port: int, server_name: str) -> bytes:
     """
     if not (0 <= server_tcp_port <= 0xFFFF):
         raise ValueError("server_tcp_port must fit in 2 bytes (0..65535)")
-    name_bytes = encode_fixed_name_32(server_name)
+    name_bytes = encode_name_field(server_name)
 
-    return struct.pack("!IBH32s", PROTOCOL_MAGIC_COOKIE, MSG_TYPE_OFFER, server_tcp_port, name_bytes) #
+    return _OFFER_S.pack(PROTOCOL_MAGIC_COOKIE, MSG_TYPE_OFFER, server_tcp_port, name_bytes)
 
 
 
-def unpack_offer(data: bytes) -> Optional[dict]:
+def unpack_offer(data: bytes) -> Optional[Offer]:
     """
     Parse and validate an Offer message.
-    Return dict with: server_tcp_port, server_name
+    Return Offer with: server_tcp_port, server_name
     Return None if invalid.
     """
     # length check (Offer must be exactly 39 bytes)
-    if len(data) != OFFER_MESSAGE_BYTES:
+    if len(data) != _OFFER_S.size:
         return None
 
-    # unpack according to the offer format
-    cookie, msg_type, tcp_port, name_b = struct.unpack("!IBH32s", data)
-
     # validate cookie and message type
-    if cookie != PROTOCOL_MAGIC_COOKIE:
-        return None
-    if msg_type != MSG_TYPE_OFFER:
+    if data[:_HDR_BYTES] != _OFFER_HDR:
         return None
 
+    # unpack the rest according to the offer format
+    tcp_port, name_b = _OFFER_TAIL_S.unpack_from(data, _HDR_BYTES)
+
     # decode the fixed-length name
     server_name = decode_fixed_name_32(name_b)
 
-    return {
-        "server_tcp_port": tcp_port,
-        "server_name": server_name,
-    }
+    return Offer(tcp_port, server_name)
 
 
 
@@ -108,11 +158,10 @@ def pack_request(rounds: int, client_team_name: str) -> bytes:
     if not (0 <= rounds <= 255):
         raise ValueError("rounds must fit in 0..255 (1 byte)")
 
-    name_b = encode_fixed_name_32(client_team_name)
+    name_b = encode_name_field(client_team_name)
 
     # Network byte order (big-endian): ! I B B 32s
-    return struct.pack(
-        "!IBB32s",
+    return _REQ_S.pack(
         PROTOCOL_MAGIC_COOKIE,
         MSG_TYPE_REQUEST,
         rounds,
@@ -121,25 +170,23 @@ def pack_request(rounds: int, client_team_name: str) -> bytes:
 
 
 
-def unpack_request(data: bytes):
+def unpack_request(data: bytes) -> Optional[Request]:
     """
     Parse and validate a Request message.
-    Return dict with: rounds, client_team_name
+    Return Request with: rounds, client_team_name
     Return None if invalid.
     """
     # length check (Request must be exactly 38 bytes)
-    if len(data) != REQUEST_MESSAGE_BYTES:
+    if len(data) != _REQ_S.size:
         return None
 
-    # unpack according to the request format
-    cookie, msg_type, rounds, name_b = struct.unpack("!IBB32s", data)
-
     # validate cookie and message type
-    if cookie != PROTOCOL_MAGIC_COOKIE:
-        return None
-    if msg_type != MSG_TYPE_REQUEST:
+    if data[:_HDR_BYTES] != _REQ_HDR:
         return None
 
+    # unpack the rest according to the request format
+    rounds, name_b = _REQ_TAIL_S.unpack_from(data, _HDR_BYTES)
+
     # (optional sanity) rounds is 1 byte anyway, but you can still validate
     if not (0 <= rounds <= 255):
         return None
@@ -147,10 +194,7 @@ def unpack_request(data: bytes):
     # decode the fixed-length name
     team_name = decode_fixed_name_32(name_b)
 
-    return {
-        "rounds": rounds,
-        "client_team_name": team_name,
-    }
+    return Request(rounds, team_name)
 
 
 
@@ -165,15 +209,11 @@ def pack_client_payload_decision(decision: str) -> bytes:
     cookie(4) | type(1=0x4) | decision(5)
     decision must be exactly "Hittt" or "Stand".
     """
-    if decision not in ("Hittt", "Stand"):
+    decision_b = _DECISION_ENCODED.get(decision)
+    if decision_b is None:
         raise ValueError('decision must be "Hittt" or "Stand"')
 
-    decision_b = decision.encode("ascii")  # should be 5 bytes
-    if len(decision_b) != CLIENT_DECISION_FIELD_BYTES:
-        raise ValueError("decision must be exactly 5 bytes")
-
-    return struct.pack(
-        "!IB5s",
+    return _CPAY_S.pack(
         PROTOCOL_MAGIC_COOKIE,
         MSG_TYPE_PAYLOAD,
         decision_b,
@@ -181,27 +221,25 @@ def pack_client_payload_decision(decision: str) -> bytes:
 
 
 
-def unpack_client_payload_decision(data: bytes):
+def unpack_client_payload_decision(data: bytes) -> Optional[ClientDecision]:
     """
     Parse and validate a client payload decision message (10 bytes).
-    Return dict with: decision
+    Accepts any buffer (bytes / bytearray / memoryview) - parsed in place, no copy.
+    Return ClientDecision with: decision
     Return None if invalid.
     """
-    if len(data) != CLIENT_PAYLOAD_MESSAGE_BYTES:
+    if len(data) != _CPAY_S.size:
         return None
 
-    cookie, msg_type, decision_b = struct.unpack("!IB5s", data)
-
-    if cookie != PROTOCOL_MAGIC_COOKIE:
-        return None
-    if msg_type != MSG_TYPE_PAYLOAD:
+    if data[:_HDR_BYTES] != _PAYLOAD_HDR:
         return None
 
-    decision = decision_b.decode("ascii", errors="replace")
-    if decision not in ("Hittt", "Stand"):
+    # compare the raw 5 bytes directly - no ascii decode per message
+    decision = _DECISION_DECODED.get(bytes(data[_HDR_BYTES:]))
+    if decision is None:
         return None
 
-    return {"decision": decision}
+    return ClientDecision(decision)
 
 
 
@@ -213,11 +251,8 @@ def unpack_client_payload_decision(data: bytes):
 # suit: 0..3 in 1 byte (HDCS)
 # -------------------------
 
-def pack_server_payload(result: int, rank: int, suit: int) -> bytes:
-    """
-    Build a server payload message (9 bytes):
-    cookie(4) | type(1=0x4) | result(1) | rank(2) | suit(1)
-    """
+def _check_server_payload_fields(result: int, rank: int, suit: int) -> None:
+    """Raise ValueError naming the out-of-range field (only called once the fast check failed)."""
     if not (0 <= result <= 3):
         raise ValueError("result must be 0..3")
     if not (1 <= rank <= 13):
@@ -225,34 +260,48 @@ def pack_server_payload(result: int, rank: int, suit: int) -> bytes:
     if not (0 <= suit <= 3):
         raise ValueError("suit must be 0..3")
 
-    return struct.pack(
-        "!IBBHB",
-        PROTOCOL_MAGIC_COOKIE,
-        MSG_TYPE_PAYLOAD,
-        result,
-        rank,
-        suit,
-    )
 
+def pack_server_payload(result: int, rank: int, suit: int) -> bytes:
+    """
+    Build a server payload message (9 bytes):
+    cookie(4) | type(1=0x4) | result(1) | rank(2) | suit(1)
+    """
+    if not (0 <= result <= 3 and 1 <= rank <= 13 and 0 <= suit <= 3):
+        _check_server_payload_fields(result, rank, suit)
 
+    return _SPAY_TABLE[(result << 6) | (rank << 2) | suit]
 
-def unpack_server_payload(data: bytes):
+
+def pack_server_payload_into(buf, offset: int, result: int, rank: int, suit: int) -> None:
+    """
+    Same as pack_server_payload, but writes the 9 bytes into a caller-owned
+    writable buffer (bytearray / memoryview) at `offset` - no allocation per message.
+    Raises ValueError if the 9 bytes don't fit in buf at that offset.
+    """
+    if not (0 <= result <= 3 and 1 <= rank <= 13 and 0 <= suit <= 3):
+        _check_server_payload_fields(result, rank, suit)
+
+    # through a memoryview: a too-short buffer raises instead of silently growing the bytearray
+    memoryview(buf)[offset:offset + _SPAY_SIZE] = _SPAY_TABLE[(result << 6) | (rank << 2) | suit]
+
+
+
+def unpack_server_payload(data: bytes) -> Optional[ServerPayload]:
     """
     Parse and validate a server payload message (9 bytes).
-    Return dict with: result, rank, suit
+    Accepts any buffer (bytes / bytearray / memoryview) - parsed in place, no copy.
+    Return ServerPayload with: result, rank, suit
     Return None if invalid.
     """
-    if len(data) != SERVER_PAYLOAD_MESSAGE_BYTES:
+    if len(data) != _SPAY_S.size:
         return None
 
-    cookie, msg_type, result, rank, suit = struct.unpack("!IBBHB", data)
-
-    if cookie != PROTOCOL_MAGIC_COOKIE:
-        return None
-    if msg_type != MSG_TYPE_PAYLOAD:
+    if data[:_HDR_BYTES] != _PAYLOAD_HDR:
         return None
+
+    result, rank, suit = _spay_tail_unpack_from(data, _HDR_BYTES)
     if not (0 <= result <= 3 and 1 <= rank <= 13 and 0 <= suit <= 3):
         return None
 
-    return {"result": result, "rank": rank, "suit": suit}
+    return ServerPayload(result, rank, suit)
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import random
-from dataclasses import dataclass
+from array import array
 from typing import List, Tuple
 
 
@@ -10,35 +10,60 @@ RESULT_LOSS     = 0x2
 RESULT_WIN      = 0x3
 
 
-@dataclass(frozen=True)
-class Card:
-    rank: int  # 1..13  (Ace=1, J=11, Q=12, K=13)
-    suit: int  # 0..3
+# A card is a small packed int: (rank << 2) | suit
+#   rank: 1..13  (Ace=1, J=11, Q=12, K=13)
+#   suit: 0..3
+Card = int
+
+
+def make_card(rank: int, suit: int) -> Card:
+    return (rank << 2) | suit
+
+
+def rank_of(card: Card) -> int:
+    return card >> 2
+
+
+def suit_of(card: Card) -> int:
+    return card & 3
+
+
+# The 52 packed cards of a fresh deck, built once; Deck.reset copies it and shuffles
+_PRISTINE = array("B", [make_card(rank, suit) for suit in range(4) for rank in range(1, 14)])
 
 
 class Deck:
+    """
+    52 packed cards in a fixed byte array, dealt by moving a cursor (no list resizing).
+    Reshuffled in place once all cards were drawn.
+    """
+
     def __init__(self, rng: random.Random | None = None):
         self.rng = rng or random.Random()
-        self.cards: List[Card] = []
+        self.cards = array("B", _PRISTINE)
+        self.pos = 0  # index of the next card to deal
         self.reset()
 
     def reset(self) -> None:
-        self.cards = [Card(rank, suit) for suit in range(4) for rank in range(1, 14)]
-        self.rng.shuffle(self.cards)
+        self.cards[:] = _PRISTINE  # 52-byte copy, no per-card Python work
+        self.rng.shuffle(self.cards)  # in-place Fisher-Yates on the array
+        self.pos = 0
 
     def draw(self) -> Card:
-        if not self.cards:
+        if self.pos >= len(self.cards):
             self.reset()
-        return self.cards.pop()
+        c = self.cards[self.pos]
+        self.pos += 1
+        return c
+
+
+# Blackjack value by rank (index 0 unused): A=1 (upgraded in hand_value), 2..10 face value, J/Q/K=10
+_VAL = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
 
 
 def card_value_for_hand(rank: int) -> int:
     """Blackjack value (Ace handled in hand_value)."""
-    if rank == 1:
-        return 1
-    if 2 <= rank <= 10:
-        return rank
-    return 10  # J,Q,K
+    return _VAL[rank]
 
 
 def hand_value(hand: List[Card]) -> Tuple[int, bool]:
@@ -49,10 +74,9 @@ def hand_value(hand: List[Card]) -> Tuple[int, bool]:
     total = 0
     aces = 0
     for c in hand:
-        v = card_value_for_hand(c.rank)
-        total += v
-        if c.rank == 1:
-            aces += 1
+        rank = c >> 2  # rank_of(c), inlined
+        total += _VAL[rank]
+        aces += (rank == 1)
 
     is_soft = False
     if aces > 0 and total + 10 <= 21:  # upgrade one Ace from 1 -> 11 (adds +10)
@@ -75,10 +99,17 @@ class BlackjackRound:
         self.player: List[Card] = []
         self.dealer: List[Card] = []
         self.phase = "INIT"  # INIT -> PLAYER -> DEALER -> OVER
+        # running dealer hand state (Aces counted as 1), kept in sync with self.dealer
+        self._d_total = 0
+        self._d_aces = 0
 
     def start(self) -> List[Card]:
         self.player = [self.deck.draw(), self.deck.draw()]
-        self.dealer = [self.deck.draw(), self.deck.draw()]
+        self.dealer = []
+        self._d_total = 0
+        self._d_aces = 0
+        self.dealer_draw()
+        self.dealer_draw()
         self.phase = "PLAYER"
         # We will send: player[0], player[1], dealer[0] as "upcard"
         return [self.player[0], self.player[1], self.dealer[0]]
@@ -91,8 +122,17 @@ class BlackjackRound:
     def dealer_draw(self) -> Card:
         c = self.deck.draw()
         self.dealer.append(c)
+        rank = c >> 2  # rank_of(c), inlined
+        self._d_total += _VAL[rank]
+        self._d_aces += (rank == 1)
         return c
 
+    def _dealer_total(self) -> int:
+        """Best dealer total in O(1) from the running state (same result as hand_value(self.dealer)[0])."""
+        if self._d_aces and self._d_total + 10 <= 21:
+            return self._d_total + 10
+        return self._d_total
+
     def _final_result(self) -> int:
         p_total, _ = hand_value(self.player)
         d_total, _ = hand_value(self.dealer)
@@ -114,10 +154,6 @@ class BlackjackRound:
         """
         out: List[tuple[int, Card]] = []
 
-        if self.phase != "PLAYER":
-            # After player stands, client should keep sending "Stand" while server finishes dealer.
-            decision = "Stand"
-
         if self.phase == "PLAYER":
             if decision == "Hittt":
                 c = self.player_hit()
@@ -135,9 +171,10 @@ class BlackjackRound:
                 out.append((RESULT_NOT_OVER, self.dealer[1]))  # reveal hole card
 
         if self.phase == "DEALER":
+            # The dealer's play is fully determined now: draw everything in one go,
+            # so the whole dealer sequence goes out as one batch of payloads.
             while True:
-                d_total, _ = hand_value(self.dealer)
-                if d_total >= 17:
+                if self._dealer_total() >= 17:
                     self.phase = "OVER"
                     # Send one "final" payload: use last dealer card (hole or last drawn)
                     last = self.dealer[-1]
@@ -146,8 +183,6 @@ class BlackjackRound:
                 c = self.dealer_draw()
                 # dealer drew a card, still not necessarily over yet
                 out.append((RESULT_NOT_OVER, c))
-                # We return after each dealer draw to keep ping-pong stable
-                return out
 
         # If OVER already:
         last = (self.dealer[-1] if self.dealer else self.player[-1])
@@ -12,63 +12,76 @@ from common.constants import (
 from common.protocol import (
     pack_offer,
     unpack_request,
-    pack_server_payload,
+    pack_server_payload_into,
     unpack_client_payload_decision,
 )
-from common.net_utils import recv_exact
+from common.net_utils import FramedReader
 
-from server.game import Deck, BlackjackRound, RESULT_NOT_OVER
+from server.game import Deck, BlackjackRound, RESULT_NOT_OVER, rank_of, suit_of
 
 BROADCAST_ADDR = "255.255.255.255"
 OFFER_INTERVAL_SEC = 1.0
 
 
-def play_session_blackjack(client_sock: socket.socket, rounds: int) -> None:
+def send_payloads(client_sock: socket.socket, send_buf: bytearray, payloads) -> bytearray:
+    """
+    Pack (result, card) payloads back to back and send them with a single sendall()
+    (one syscall / one segment instead of one per 9-byte payload).
+    Stops after the first final payload (result != 0).
+    Returns the buffer to reuse next time (replaced by a bigger one if it was too small).
+    """
+    size = len(payloads) * SERVER_PAYLOAD_MESSAGE_BYTES
+    if len(send_buf) < size:
+        send_buf = bytearray(size)
+
+    off = 0
+    for result, card in payloads:
+        pack_server_payload_into(send_buf, off, result, rank_of(card), suit_of(card))
+        off += SERVER_PAYLOAD_MESSAGE_BYTES
+        if result != 0:
+            # round ended
+            break
+
+    client_sock.sendall(memoryview(send_buf)[:off])
+    return send_buf
+
+
+def play_session_blackjack(client_sock: socket.socket, rounds: int, reader: FramedReader | None = None) -> None:
     """
     Plays `rounds` blackjack rounds with one connected client.
     Uses server/game.py for rules + state.
+    `reader` is the connection's buffered reader (pass the one that read the request,
+    so bytes it already buffered are not lost).
     """
+    if reader is None:
+        reader = FramedReader(client_sock)
+
+    # preallocated per-session send buffer: no bytes object per message
+    send_buf = bytearray(SERVER_PAYLOAD_MESSAGE_BYTES * 8)  # room for a typical batch
 
     for round_i in range(rounds):
         deck = Deck()
         game = BlackjackRound(deck)
 
-        # 1) Initial deal: send 3 payloads (player, player, dealer upcard)
+        # 1) Initial deal: send 3 payloads (player, player, dealer upcard) in one write
         initial_cards = game.start()  # [player1, player2, dealer_up]
-        for c in initial_cards:
-            client_sock.sendall(pack_server_payload(RESULT_NOT_OVER, c.rank, c.suit))
-
-        player_turn = True
-        last_decision = None
+        send_buf = send_payloads(client_sock, send_buf, [(RESULT_NOT_OVER, c) for c in initial_cards])
 
-        # 2) Round loop
+        # 2) Round loop: one client decision -> one batch of payloads, until the round is over
         while True:
-            if player_turn:
-                # wait for client decision
-                raw = recv_exact(client_sock, CLIENT_PAYLOAD_MESSAGE_BYTES)
-                dec = unpack_client_payload_decision(raw)
-                if dec is None:
-                    print("[SERVER] Invalid client decision payload")
-                    return
-                last_decision = dec["decision"]
-
-                if last_decision == "Stand":
-                    player_turn = False
-
-                events = game.apply_decision(last_decision)
-
-            else:
-                # dealer phase: server advances without needing more client messages
-                events = game.apply_decision("Stand")
-
-            # send all produced events (usually 1; may be 2 when revealing hole+final, etc.)
-            for result, card in events:
-                client_sock.sendall(pack_server_payload(result, card.rank, card.suit))
-                if result != 0:
-                    # round ended
-                    break
-
-            if events and events[-1][0] != 0:
+            # wait for client decision
+            dec = unpack_client_payload_decision(reader.read(CLIENT_PAYLOAD_MESSAGE_BYTES))
+            if dec is None:
+                print("[SERVER] Invalid client decision payload")
+                return
+
+            events = game.apply_decision(dec.decision)
+
+            # send all produced events in one write: the drawn card after a Hit, or after a
+            # Stand the hole card + every dealer draw + the final result
+            send_buf = send_payloads(client_sock, send_buf, events)
+
+            if events[-1][0] != 0:
                 break
 
 
@@ -81,20 +94,20 @@ def handle_client(client_sock: socket.socket, client_addr):
     """
     print(f"[SERVER] Handling client {client_addr} in a new thread")
     try:
-        # read + parse request
-        req_bytes = recv_exact(client_sock, REQUEST_MESSAGE_BYTES)
-        req = unpack_request(req_bytes)
+        # read + parse request (buffered: decisions that follow are served from the same reader)
+        reader = FramedReader(client_sock)
+        req = unpack_request(reader.read(REQUEST_MESSAGE_BYTES))
 
         if req is None:
             print(f"[SERVER] Invalid request received from {client_addr}")
             return
 
-        rounds = req["rounds"]
-        team = req["client_team_name"]
+        rounds = req.rounds
+        team = req.client_team_name
         print(f"[SERVER] Request OK: rounds={rounds} team='{team}'")
 
         # play blackjack session
-        play_session_blackjack(client_sock, rounds)
+        play_session_blackjack(client_sock, rounds, reader)
         print(f"[SERVER] Finished session with {client_addr}")
 
     except Exception as e:
@@ -120,6 +133,9 @@ def main():
 
     print(f"[SERVER] Name='{server_name}' | UDP offers on {OFFER_BROADCAST_UDP_PORT} | TCP port={tcp_port}")
 
+    # the offer never changes for the lifetime of the server: build it once
+    offer_bytes = pack_offer(tcp_port, server_name)
+
     next_offer_time = 0.0
 
     try:
@@ -128,8 +144,7 @@ def main():
 
             # 1) Broadcast offer every interval (when idle / waiting for a client)
             if now >= next_offer_time:
-                offer = pack_offer(tcp_port, server_name)
-                udp_sock.sendto(offer, (BROADCAST_ADDR, OFFER_BROADCAST_UDP_PORT))
+                udp_sock.sendto(offer_bytes, (BROADCAST_ADDR, OFFER_BROADCAST_UDP_PORT))
                 next_offer_time = now + OFFER_INTERVAL_SEC
 
             # 2) Non-blocking accept (so we can still broadcast offers)
@@ -158,8 +173,8 @@ def main():
                 #         print("[SERVER] Invalid request received")
                 #         continue
                 #
-                #     rounds = req["rounds"]
-                #     team = req["client_team_name"]
+                #     rounds = req.rounds
+                #     team = req.client_team_name
                 #     print(f"[SERVER] Request OK: rounds={rounds} team='{team}'")
                 #
                 #     # play blackjack session